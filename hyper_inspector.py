@@ -6,13 +6,29 @@ Inspects Tableau .hyper files and extracts metadata and schema information
 
 import sys
 import json
+import math
 import os
 import argparse
-from pathlib import Path
-from typing import Dict, List, Any, Optional
+import csv
+import re
+import shutil
+import socket
+import socketserver
+import stat
+import gzip
+import io
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from itertools import groupby, islice
+from typing import Dict, List, Any, Optional, Iterator, Tuple, TextIO, Callable, ContextManager, Sequence
 
 try:
-    from tableauhyperapi import HyperProcess, Telemetry, Connection, CreateMode, HyperException
+    from tableauhyperapi import HyperProcess, Telemetry, Connection, CreateMode, HyperException, \
+        escape_name, escape_string_literal
 except ImportError:
     print(json.dumps({
         "error": "tableauhyperapi not installed. Run: pip install tableauhyperapi",
@@ -20,37 +36,339 @@ except ImportError:
     }))
     sys.exit(1)
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    # Optional: only needed for Parquet exports
+    pa = None
+    pq = None
+
+try:
+    import orjson
+except ImportError:
+    # Optional: the json module is used when orjson isn't installed
+    orjson = None
+
+
+# Capped exports with --random-sample only use TABLESAMPLE on tables estimated
+# to hold this many times more rows than the cap, and sample this many times
+# the fraction of the table the cap needs
+TABLESAMPLE_MIN_RATIO = 10
+TABLESAMPLE_HEADROOM = 1.5
+
+# Tables counted per UNION ALL query, to keep statements reasonably sized
+COUNT_BATCH_SIZE = 500
+
+# Rows buffered per record batch when streaming a table to a Parquet file
+PARQUET_BATCH_ROWS = 65536
+
+# Arrow types of the Hyper column types Parquet files keep as they are; other
+# types without a direct equivalent (time, interval, geography, ...) are written as text
+ARROW_TYPE_NAMES = {
+    "smallint": "int16",
+    "integer": "int32",
+    "bigint": "int64",
+    "oid": "uint32",
+    "real": "float32",
+    "double precision": "float64",
+    "boolean": "bool_",
+    "bytea": "binary",
+    "date": "date32",
+}
+
+# Idle file connections the serve daemon keeps open between requests, and
+# how long an idle one is kept before it is closed
+DAEMON_MAX_CONNECTIONS = 8
+DAEMON_CONNECTION_TTL_MINUTES = 10
+
+# Reused by _dumps, since json.dumps(default=...) builds a new encoder per call;
+# compact separators as orjson writes them
+_json_encoder = json.JSONEncoder(default=str, ensure_ascii=False, separators=(',', ':'))
+
+
+def _dumps(value: Any, indent: bool = False) -> str:
+    """
+    Serialize a value to JSON, with orjson when it is installed
+    
+    Values JSON has no type for (Decimal, Hyper date types, ...) are stringified.
+    The json fallback is set up to write the same layout as orjson: compact
+    separators, or a two-space indent, and non-ASCII characters as they are, so the
+    output must be written to a UTF-8 stream. Floats may still be spelled
+    differently (1e+16 rather than 1e16), and the json module writes non-finite
+    floats as NaN/Infinity where orjson writes null; float columns are mapped to
+    null before encoding (see _finite_or_none).
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    if indent:
+        return json.dumps(value, indent=2, default=str, ensure_ascii=False)
+    return _json_encoder.encode(value)
+
+
+def _temporal_to_iso(value: Any) -> Optional[str]:
+    """Render a date/time value as an ISO string, passing NULLs through"""
+    if value is None:
+        return None
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def _finite_or_none(value: Optional[float]) -> Optional[float]:
+    """Turn NaN and +/-Infinity into NULL, since JSON has no literal for them"""
+    if value is None or math.isfinite(value):
+        return value
+    return None
+
+
+def _column_converters(column_types: Sequence[str]) -> List[Optional[Callable[[Any], Any]]]:
+    """
+    Choose how each column's values are made JSON-serializable, once per table
+    
+    Column types are fixed for the whole table, so the check is made on the declared
+    type instead of on every value. None means the value is passed through as is.
+    """
+    converters = []
+    for column_type in column_types:
+        column_type = column_type.lower()
+        if column_type.startswith(("date", "time")):
+            converters.append(_temporal_to_iso)
+        elif column_type in ("double precision", "real"):
+            converters.append(_finite_or_none)
+        else:
+            converters.append(None)
+    return converters
+
+
+def _compile_row_converter(columns: List[Dict[str, Any]], as_tuple: bool = False) -> Callable[[Sequence[Any]], Any]:
+    """
+    Generate a function that turns a result row of these columns into a dictionary
+    
+    The column names and converters are written into the function's source, so
+    converting a row is a single dict display with no loop or per-column dispatch.
+    With as_tuple, the function returns the converted values as a tuple instead,
+    for writers that don't need the column names on every row.
+    """
+    column_names = tuple(column["name"] for column in columns)
+    column_types = tuple(column["type"] for column in columns)
+    return _generate_row_converter(column_names, column_types, as_tuple)
+
+
+@lru_cache(maxsize=256)
+def _generate_row_converter(column_names: Tuple[str, ...], column_types: Tuple[str, ...], as_tuple: bool) -> Callable[[Sequence[Any]], Any]:
+    """
+    Compile the row converter for a column layout
+    
+    Converters are cached by layout, so tables that share their columns and repeated
+    requests to the daemon reuse the compiled function instead of generating it again.
+    """
+    namespace = {}
+    fields = []
+    for i, (column_name, convert) in enumerate(zip(column_names, _column_converters(column_types))):
+        value = f"row[{i}]"
+        if convert is not None:
+            namespace[f"convert_{i}"] = convert
+            value = f"convert_{i}({value})"
+        fields.append(value if as_tuple else f"{column_name!r}: {value}")
+    
+    if as_tuple:
+        source = "def convert_row(row):\n    return (" + "".join(field + ", " for field in fields) + ")\n"
+    else:
+        source = "def convert_row(row):\n    return {" + ", ".join(fields) + "}\n"
+    exec(compile(source, "<row converter>", "exec"), namespace)
+    return namespace["convert_row"]
+
+
+def _arrow_type(column_type: str) -> Any:
+    """Choose the Arrow type a Hyper column is written to Parquet as"""
+    column_type = column_type.lower()
+    numeric = re.fullmatch(r"numeric\((\d+),\s*(\d+)\)", column_type)
+    if numeric:
+        return pa.decimal128(int(numeric.group(1)), int(numeric.group(2)))
+    if column_type.startswith("timestamp"):
+        return pa.timestamp("us", tz="UTC" if column_type.endswith("with time zone") else None)
+    type_name = ARROW_TYPE_NAMES.get(column_type)
+    return getattr(pa, type_name)() if type_name else pa.string()
+
+
+def _arrow_array(values: Sequence[Any], arrow_type: Any) -> Any:
+    """
+    Build the Arrow array of one column of a batch of converted rows
+    
+    Dates and timestamps arrive as ISO strings from the row converter and are
+    parsed back by Arrow; values of columns written as text are stringified.
+    """
+    if pa.types.is_date(arrow_type) or pa.types.is_timestamp(arrow_type):
+        return pa.array(values, pa.string()).cast(arrow_type)
+    if pa.types.is_string(arrow_type):
+        values = [value if value is None or isinstance(value, str) else str(value) for value in values]
+    return pa.array(values, arrow_type)
+
+
+def _table_file_name(table: Dict[str, Any], extension: str, used_names: set) -> str:
+    """
+    Name the file a table is exported to, e.g. Extract.Orders.csv
+    
+    Characters that aren't safe in file names, and dots and percent signs within
+    the schema or table name, are percent-encoded, so distinct tables never map
+    to the same name. A numeric suffix keeps names apart that only differ in
+    case, for case-insensitive file systems. used_names collects the names
+    handed out so far.
+    """
+    def encode(part: str) -> str:
+        return re.sub(r'[^\w -]', lambda match: ''.join(f'%{byte:02X}' for byte in match.group().encode('utf-8')), part)
+    
+    base_name = f"{encode(table['schema'])}.{encode(table['name'])}"
+    file_name = base_name + extension
+    suffix = 2
+    while file_name.lower() in used_names:
+        file_name = f"{base_name}-{suffix}{extension}"
+        suffix += 1
+    used_names.add(file_name.lower())
+    return file_name
+
+
+def _scan_hyper_files(directory: str) -> Iterator[os.DirEntry]:
+    """Recursively yield directory entries for .hyper files, skipping unreadable directories"""
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _scan_hyper_files(entry.path)
+                elif entry.name.lower().endswith('.hyper') and entry.is_file():
+                    yield entry
+    except OSError:
+        return
+
 
 class HyperFileInspector:
     """Inspector for Tableau Hyper files"""
     
-    def __init__(self):
+    def __init__(self, max_connections: int = 0, connection_ttl: Optional[float] = None):
+        """
+        Args:
+            max_connections: Number of idle file connections to keep open for reuse
+                (0 = open a fresh connection for every call)
+            connection_ttl: Seconds an idle cached connection is kept before it is
+                closed (None = until evicted or the inspector exits)
+        """
         self.hyper_process = None
+        self.max_connections = max_connections
+        self.connection_ttl = connection_ttl
+        # Idle connections with the time they were last released, oldest first
+        self._connections: "OrderedDict[str, Tuple[Connection, float]]" = OrderedDict()
+        self._connections_lock = threading.Lock()
+        self._closing = threading.Event()
+        self._reaper = None
         
     def __enter__(self):
         """Start Hyper process"""
         try:
             self.hyper_process = HyperProcess(telemetry=Telemetry.DO_NOT_SEND_USAGE_DATA_TO_TABLEAU)
-            return self
         except Exception as e:
             raise HyperException(f"Failed to start Hyper process: {str(e)}")
+        
+        if self.max_connections and self.connection_ttl:
+            self._closing.clear()
+            self._reaper = threading.Thread(target=self._close_expired_connections, name="hyper-connection-reaper", daemon=True)
+            self._reaper.start()
+        return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Stop Hyper process"""
+        if self._reaper is not None:
+            self._closing.set()
+            self._reaper.join()
+            self._reaper = None
+        with self._connections_lock:
+            while self._connections:
+                self._connections.popitem()[1][0].close()
         if self.hyper_process:
             self.hyper_process.close()
     
-    def export_file_data(self, file_path: str, include_sample_only: bool = False, max_rows_per_table: int = None) -> Dict[str, Any]:
+    def _close_expired_connections(self) -> None:
+        """Close cached connections that have been idle for longer than connection_ttl, until exit"""
+        # Check a few times per TTL so connections don't outlive it by much
+        interval = min(self.connection_ttl / 4, 60)
+        while not self._closing.wait(interval):
+            expired = []
+            deadline = time.monotonic() - self.connection_ttl
+            with self._connections_lock:
+                # Oldest first, so stop at the first connection still in its TTL
+                while self._connections:
+                    file_path, (connection, last_used) = next(iter(self._connections.items()))
+                    if last_used > deadline:
+                        break
+                    del self._connections[file_path]
+                    expired.append(connection)
+            for connection in expired:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+    
+    @contextmanager
+    def _connect(self, file_path: str) -> Iterator[Connection]:
         """
-        Export all data from a .hyper file to JSON format
+        Connect to a .hyper file, reusing an idle cached connection when caching is enabled
+        
+        Connections are cached per file path in least-recently-used order; the oldest
+        are closed once more than max_connections are idle, and any idle for longer
+        than connection_ttl are closed in the background.
+        """
+        if not self.max_connections:
+            with Connection(
+                endpoint=self.hyper_process.endpoint,
+                database=file_path,
+                create_mode=CreateMode.NONE
+            ) as connection:
+                yield connection
+            return
+        
+        with self._connections_lock:
+            connection, _ = self._connections.pop(file_path, (None, None))
+        if connection is None:
+            connection = Connection(
+                endpoint=self.hyper_process.endpoint,
+                database=file_path,
+                create_mode=CreateMode.NONE
+            )
+        
+        try:
+            yield connection
+        except BaseException:
+            # Don't hand a connection that may be mid-query to the next caller
+            connection.close()
+            raise
+        
+        with self._connections_lock:
+            self._connections[file_path] = (connection, time.monotonic())
+            while len(self._connections) > self.max_connections:
+                self._connections.popitem(last=False)[1][0].close()
+    
+    def release_connection(self, file_path: str) -> bool:
+        """
+        Close the cached idle connection to a file, if any, so other processes can open it
+        
+        A cached connection keeps the file attached to this inspector's Hyper process,
+        which stops other processes (Tableau refreshing an extract, for one) from
+        opening it until the connection expires.
         
-        Args:
-            file_path: Path to the .hyper file
-            include_sample_only: If True, only export sample data (first 5 rows per table)
-            max_rows_per_table: Maximum number of rows to export per table (None = all rows)
-            
         Returns:
-            Dictionary containing all file data in JSON format
+            True if a connection was closed
+        """
+        with self._connections_lock:
+            connection, _ = self._connections.pop(file_path, (None, None))
+        if connection is None:
+            return False
+        connection.close()
+        return True
+    
+    def _check_hyper_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Validate that a path points at an existing .hyper file
+
+        Returns:
+            An error result dictionary, or None if the file can be opened
         """
         if not os.path.exists(file_path):
             return {
@@ -64,154 +382,391 @@ class HyperFileInspector:
                 "success": False
             }
         
+        return None
+    
+    def _list_tables(self, connection: Connection, schemas: List[str]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        List the tables of the given schemas together with their columns
+        
+        All columns of all tables are read with a single catalog query and grouped
+        per table, rather than querying pg_attribute once per table.
+        
+        Returns:
+            (tables, table_oids): table dictionaries (schema, name, full_name, type,
+            columns), ordered by schema as given and then by table name, and the
+            pg_class OID of each table so follow-up catalog queries can skip name lookups
+        """
+        if not schemas:
+            return [], []
+        
+        schema_list = ", ".join(escape_string_literal(schema) for schema in schemas)
+        columns_query = f"""
+            SELECT 
+                n.nspname as schema_name,
+                c.relname as table_name,
+                c.oid as table_oid,
+                a.attname as column_name,
+                pg_catalog.format_type(a.atttypid, a.atttypmod) as data_type,
+                CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END as is_nullable,
+                NULL as column_default
+            FROM pg_attribute a
+            JOIN pg_class c ON a.attrelid = c.oid
+            JOIN pg_namespace n ON c.relnamespace = n.oid
+            JOIN pg_tables t ON t.schemaname = n.nspname AND t.tablename = c.relname
+            WHERE n.nspname IN ({schema_list})
+                AND a.attnum > 0 
+                AND NOT a.attisdropped
+            ORDER BY n.nspname, c.relname, a.attnum
+        """
+        
+        tables_by_schema = {schema: [] for schema in schemas}
+        # Grouped as the result is read, so the full catalog is never held as rows
+        with connection.execute_query(columns_query) as col_rows:
+            for (schema, table_name, table_oid), table_cols in groupby(col_rows, key=lambda col_row: tuple(col_row[:3])):
+                table = {
+                    "schema": schema,
+                    "name": table_name,
+                    "full_name": f'{escape_name(schema)}.{escape_name(table_name)}',
+                    "type": "TABLE",
+                    "columns": [
+                        {
+                            "name": col_row[3],
+                            "type": col_row[4],
+                            "nullable": col_row[5] == "YES",
+                            "default": col_row[6]
+                        }
+                        for col_row in table_cols
+                    ]
+                }
+                tables_by_schema[schema].append((table, table_oid))
+        
+        ordered = [entry for schema in schemas for entry in tables_by_schema[schema]]
+        return [table for table, _ in ordered], [table_oid for _, table_oid in ordered]
+    
+    def _count_rows(self, connection: Connection, full_table_names: List[str]) -> List[Optional[int]]:
+        """
+        Count the rows of many tables with one UNION ALL query per batch of tables
+        
+        Returns:
+            Row counts in the order of full_table_names, None where a table could not be counted
+        """
+        row_counts = []
+        
+        for start in range(0, len(full_table_names), COUNT_BATCH_SIZE):
+            batch = full_table_names[start:start + COUNT_BATCH_SIZE]
+            count_query = " UNION ALL ".join(
+                f'SELECT {i} as table_index, COUNT(*) as row_count FROM {full_table_name}'
+                for i, full_table_name in enumerate(batch)
+            )
+            
+            try:
+                batch_counts = dict(connection.execute_list_query(count_query))
+                row_counts.extend(batch_counts[i] for i in range(len(batch)))
+            except:
+                # One table failed the whole batch; count this batch table by table
+                for full_table_name in batch:
+                    try:
+                        row_counts.append(connection.execute_scalar_query(f'SELECT COUNT(*) FROM {full_table_name}'))
+                    except:
+                        row_counts.append(None)
+        
+        return row_counts
+    
+    def _estimate_rows(self, connection: Connection, table_oids: List[int]) -> List[Optional[int]]:
+        """
+        Read row count estimates for the given tables from pg_class.reltuples
+        
+        Returns:
+            Estimates in table order, None where the catalog has no usable estimate
+        """
+        if not table_oids:
+            return []
+        
+        oid_list = ", ".join(str(int(table_oid)) for table_oid in table_oids)
+        estimates_query = f"""
+            SELECT c.oid as table_oid, c.reltuples as approx_rows
+            FROM pg_class c
+            WHERE c.oid IN ({oid_list})
+        """
+        
         try:
-            result = {
-                "file_path": file_path,
-                "file_name": os.path.basename(file_path),
-                "file_size": os.path.getsize(file_path),
-                "export_type": "sample_only" if include_sample_only else "full_data",
-                "max_rows_per_table": max_rows_per_table,
-                "success": True,
-                "schemas": [],
-                "tables": [],
-                "total_tables": 0,
-                "total_rows_exported": 0
-            }
+            estimates = dict(connection.execute_list_query(estimates_query))
+        except:
+            # Not every Hyper version exposes reltuples; fall back to exact counts
+            return [None] * len(table_oids)
+        
+        row_estimates = []
+        for table_oid in table_oids:
+            approx_rows = estimates.get(table_oid)
+            # A negative reltuples means the table has never been measured
+            row_estimates.append(int(approx_rows) if approx_rows is not None and approx_rows >= 0 else None)
+        return row_estimates
+    
+    def _get_row_counts(self, connection: Connection, tables: List[Dict[str, Any]], table_oids: List[int], exact: bool, count_missing: bool = True) -> Tuple[List[Optional[int]], List[bool]]:
+        """
+        Get row counts for the given tables, from catalog estimates unless exact is set
+        
+        Tables without a usable estimate are counted exactly, unless count_missing is False.
+        
+        Returns:
+            (row_counts, estimated) lists in table order; a count is None if the table
+            could not (or was not to be) counted
+        """
+        row_counts = [None] * len(tables) if exact else self._estimate_rows(connection, table_oids)
+        estimated = [row_count is not None for row_count in row_counts]
+        if not count_missing:
+            return row_counts, estimated
+        
+        uncounted = [i for i, row_count in enumerate(row_counts) if row_count is None]
+        exact_counts = self._count_rows(connection, [tables[i]["full_name"] for i in uncounted])
+        for i, row_count in zip(uncounted, exact_counts):
+            row_counts[i] = row_count
+        
+        return row_counts, estimated
+    
+    def iter_export_file_data(self, file_path: str, include_sample_only: bool = False, max_rows_per_table: int = None, workers: int = 1, random_sample: bool = False, as_tuples: bool = False) -> Iterator[Tuple[Dict[str, Any], Iterator[Any]]]:
+        """
+        Lazily export the data of a .hyper file, one table at a time
+        
+        Args:
+            file_path: Path to the .hyper file
+            include_sample_only: If True, only export sample data (first 5 rows per table)
+            max_rows_per_table: Maximum number of rows to export per table (None = all rows)
+            workers: Number of tables to read in parallel, each on its own connection
+            random_sample: If True, capped exports read a random sample of rows instead
+                of the first rows; large tables sample blocks (TABLESAMPLE)
+            as_tuples: If True, rows are tuples of values in column order instead of
+                dictionaries keyed by column name
             
-            # Connect to the Hyper file
-            with Connection(
-                endpoint=self.hyper_process.endpoint,
-                database=file_path,
-                create_mode=CreateMode.NONE
-            ) as connection:
-                
-                # Get all schemas (excluding system ones)
-                schemas_query = """
-                    SELECT table_schema as schema_name 
-                    FROM information_schema.tables 
-                    WHERE table_schema NOT IN ('information_schema', 'pg_catalog', 'pg_temp', 'tableau')
-                    GROUP BY table_schema
-                """
+        Yields:
+            (table_info, rows) pairs, where table_info holds the table metadata and rows
+            iterates over the table's rows. With a single worker, rows are read as they
+            are iterated and each rows iterator must be consumed before advancing to the
+            next table. With several workers, up to `workers` tables are read whole
+            into memory at a time and yielded in completion order.
+        """
+        # Connect to the Hyper file
+        with self._connect(file_path) as connection:
+            table_exports = self._plan_table_exports(connection, include_sample_only, max_rows_per_table, random_sample)
+            
+            if workers > 1 and len(table_exports) > 1:
+                yield from self._iter_parallel_exports(file_path, table_exports, workers, as_tuples)
+                return
+            
+            for table_info, data_query, fallback in table_exports:
+                rows = self._iter_export_rows(connection, data_query, fallback, table_info["columns"], as_tuples)
+                yield table_info, rows
+    
+    def _plan_table_exports(self, connection: Connection, include_sample_only: bool, max_rows_per_table: Optional[int], random_sample: bool) -> List[Tuple[Dict[str, Any], str, Optional[Tuple[str, int]]]]:
+        """
+        List the tables of the connected file with the query that exports each one
+        
+        Returns:
+            (table_info, data_query, fallback) for every user table. fallback is None,
+            or (fallback_query, sample_size) for block samples, which can come back
+            with fewer than sample_size rows and are then read again with fallback_query
+        """
+        # Get all schemas (excluding system ones)
+        schemas_query = """
+            SELECT table_schema as schema_name 
+            FROM information_schema.tables 
+            WHERE table_schema NOT IN ('information_schema', 'pg_catalog', 'pg_temp', 'tableau')
+            GROUP BY table_schema
+        """
+        
+        schemas = []
+        try:
+            for row in connection.execute_list_query(schemas_query):
+                schema_name = row[0]
+                schemas.append(schema_name)
+        except:
+            # Fallback to pg_tables if information_schema doesn't work
+            schemas_query = """
+                SELECT schemaname as schema_name 
+                FROM pg_tables 
+                WHERE schemaname NOT IN ('information_schema', 'pg_catalog', 'pg_temp', 'tableau')
+                GROUP BY schemaname
+            """
+            for row in connection.execute_list_query(schemas_query):
+                schema_name = row[0]
+                schemas.append(schema_name)
+        
+        # Columns and row counts for every table come back in one query each.
+        # A capped export only reads up to its cap, so it never scans a table
+        # just to count it: catalog estimates are used where available.
+        row_cap = 5 if include_sample_only else max_rows_per_table
+        tables, table_oids = self._list_tables(connection, schemas)
+        row_counts, estimated = self._get_row_counts(connection, tables, table_oids, exact=not row_cap, count_missing=not row_cap)
+        
+        table_exports = []
+        for table, total_rows, total_rows_estimated in zip(tables, row_counts, estimated):
+            full_table_name = table["full_name"]
+            
+            # Determine how many rows to export
+            fallback = None
+            if not row_cap:
+                if total_rows is None:
+                    total_rows = 0
+                data_query = f'SELECT * FROM {full_table_name}'
+            elif not random_sample or (total_rows is not None and total_rows <= row_cap):
+                data_query = f'SELECT * FROM {full_table_name} LIMIT {int(row_cap)}'
+            else:
+                # Shuffling reads the whole table, which is fine for small tables and
+                # for tables whose size isn't known
+                shuffled_query = f'SELECT * FROM {full_table_name} ORDER BY random() LIMIT {int(row_cap)}'
+                if total_rows and total_rows > row_cap * TABLESAMPLE_MIN_RATIO:
+                    # Read only about as many blocks as the cap needs, with some headroom
+                    # since SYSTEM sampling returns a varying number of rows. A sample
+                    # that comes back short (blocks hold many rows) is shuffled instead.
+                    sample_percent = 100.0 * row_cap / total_rows * TABLESAMPLE_HEADROOM
+                    data_query = f'SELECT * FROM {full_table_name} TABLESAMPLE SYSTEM ({min(sample_percent, 100.0):.10f}) LIMIT {int(row_cap)}'
+                    fallback = (shuffled_query, int(row_cap))
+                else:
+                    data_query = shuffled_query
+            
+            table_info = dict(table, total_rows=total_rows, total_rows_estimated=total_rows_estimated)
+            table_exports.append((table_info, data_query, fallback))
+        
+        return table_exports
+    
+    def _iter_parallel_exports(self, file_path: str, table_exports: List[Tuple[Dict[str, Any], str, Optional[Tuple[str, int]]]], workers: int, as_tuples: bool = False) -> Iterator[Tuple[Dict[str, Any], Iterator[Any]]]:
+        """
+        Read several tables at once on a pool of connections, one per worker thread
+        
+        Hyper runs each query natively, so tables on separate connections are read
+        concurrently. Tables are yielded as they finish. At most `workers` tables are
+        being read at a time; the next table is only submitted once one completes, so
+        memory is bounded by the tables in flight rather than the whole file.
+        """
+        worker_state = threading.local()
+        worker_connections = []
+        
+        def export_one_table(data_query: str, fallback: Optional[Tuple[str, int]], columns: List[Dict[str, Any]]) -> List[Any]:
+            if not hasattr(worker_state, "connection"):
+                worker_state.connection = Connection(
+                    endpoint=self.hyper_process.endpoint,
+                    database=file_path,
+                    create_mode=CreateMode.NONE
+                )
+                worker_connections.append(worker_state.connection)
+            return list(self._iter_export_rows(worker_state.connection, data_query, fallback, columns, as_tuples))
+        
+        workers = min(workers, len(table_exports))
+        remaining_exports = iter(table_exports)
+        futures: Dict[Future, Dict[str, Any]] = {}
+        
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                def submit_tables() -> None:
+                    for table_info, data_query, fallback in islice(remaining_exports, workers - len(futures)):
+                        futures[executor.submit(export_one_table, data_query, fallback, table_info["columns"])] = table_info
                 
-                schemas = []
                 try:
-                    for row in connection.execute_list_query(schemas_query):
-                        schema_name = row[0]
-                        schemas.append(schema_name)
-                except:
-                    # Fallback to pg_tables if information_schema doesn't work
-                    schemas_query = """
-                        SELECT schemaname as schema_name 
-                        FROM pg_tables 
-                        WHERE schemaname NOT IN ('information_schema', 'pg_catalog', 'pg_temp', 'tableau')
-                        GROUP BY schemaname
-                    """
-                    for row in connection.execute_list_query(schemas_query):
-                        schema_name = row[0]
-                        schemas.append(schema_name)
-                
-                result["schemas"] = schemas
-                
-                # Export data from all tables
-                tables_data = []
-                total_exported = 0
-                
-                for schema in schemas:
-                    # Get tables in this schema
-                    tables_query = f"""
-                        SELECT tablename as table_name, 'TABLE' as table_type
-                        FROM pg_tables 
-                        WHERE schemaname = '{schema}'
-                    """
-                    
-                    for table_row in connection.execute_list_query(tables_query):
-                        table_name = table_row[0]
-                        table_type = table_row[1]
-                        full_table_name = f'"{schema}"."{table_name}"'
-                        
-                        # Get column information
-                        columns_query = f"""
-                            SELECT 
-                                a.attname as column_name,
-                                pg_catalog.format_type(a.atttypid, a.atttypmod) as data_type,
-                                CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END as is_nullable,
-                                NULL as column_default
-                            FROM pg_attribute a
-                            WHERE a.attrelid = '"{schema}"."{table_name}"'::regclass
-                                AND a.attnum > 0 
-                                AND NOT a.attisdropped
-                            ORDER BY a.attnum
-                        """
-                        
-                        columns = []
-                        column_names = []
-                        for col_row in connection.execute_list_query(columns_query):
-                            column_info = {
-                                "name": col_row[0],
-                                "type": col_row[1],
-                                "nullable": col_row[2] == "YES",
-                                "default": col_row[3]
-                            }
-                            columns.append(column_info)
-                            column_names.append(col_row[0])
-                        
-                        # Get row count
-                        try:
-                            count_query = f'SELECT COUNT(*) FROM {full_table_name}'
-                            total_rows = connection.execute_scalar_query(count_query)
-                        except:
-                            total_rows = 0
-                        
-                        # Determine how many rows to export
-                        if include_sample_only:
-                            rows_to_export = min(5, total_rows)
-                            data_query = f'SELECT * FROM {full_table_name} LIMIT 5'
-                        elif max_rows_per_table:
-                            rows_to_export = min(max_rows_per_table, total_rows)
-                            data_query = f'SELECT * FROM {full_table_name} LIMIT {max_rows_per_table}'
-                        else:
-                            rows_to_export = total_rows
-                            data_query = f'SELECT * FROM {full_table_name}'
-                        
-                        # Export all data
-                        exported_data = []
-                        try:
-                            for data_row in connection.execute_list_query(data_query):
-                                # Convert values to JSON-serializable format
-                                row_data = {}
-                                for i, value in enumerate(data_row):
-                                    column_name = column_names[i]
-                                    if value is None:
-                                        row_data[column_name] = None
-                                    elif hasattr(value, 'isoformat'):  # DateTime objects
-                                        row_data[column_name] = value.isoformat()
-                                    else:
-                                        row_data[column_name] = value
-                                exported_data.append(row_data)
-                            
-                            total_exported += len(exported_data)
-                            
-                        except Exception as e:
-                            exported_data = []
-                            print(f"Warning: Could not export data from {full_table_name}: {e}")
-                        
-                        table_info = {
-                            "schema": schema,
-                            "name": table_name,
-                            "full_name": full_table_name,
-                            "type": table_type,
-                            "columns": columns,
-                            "total_rows": total_rows,
-                            "exported_rows": len(exported_data),
-                            "data": exported_data
-                        }
-                        
-                        tables_data.append(table_info)
+                    submit_tables()
+                    while futures:
+                        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            table_info = futures.pop(future)
+                            submit_tables()
+                            yield table_info, self._iter_future_rows(future)
+                finally:
+                    # Tables not started yet are dropped when the export is abandoned
+                    for future in futures:
+                        future.cancel()
+        finally:
+            for worker_connection in worker_connections:
+                worker_connection.close()
+    
+    def _iter_future_rows(self, future: Future) -> Iterator[Dict[str, Any]]:
+        """Yield the rows read by a worker, raising its error when iterated"""
+        yield from future.result()
+    
+    def _iter_export_rows(self, connection: Connection, data_query: str, fallback: Optional[Tuple[str, int]], columns: List[Dict[str, Any]], as_tuples: bool = False) -> Iterator[Any]:
+        """Yield the rows of a planned table export, reading a short block sample again with its fallback query"""
+        if fallback is None:
+            yield from self._iter_table_rows(connection, data_query, columns, as_tuples)
+            return
+        
+        # A sample holds at most sample_size rows, so it is kept until it is known to be complete
+        fallback_query, sample_size = fallback
+        rows = list(self._iter_table_rows(connection, data_query, columns, as_tuples))
+        if len(rows) < sample_size:
+            rows = self._iter_table_rows(connection, fallback_query, columns, as_tuples)
+        yield from rows
+    
+    def _iter_table_rows(self, connection: Connection, data_query: str, columns: List[Dict[str, Any]], as_tuples: bool = False) -> Iterator[Any]:
+        """
+        Yield the rows of a data query as JSON-serializable dictionaries (or tuples)
+        
+        Rows are pulled from the query result as they are iterated instead of being
+        collected into a list first. The connection is busy until the result is
+        exhausted or the generator is closed.
+        """
+        # Convert values to JSON-serializable format
+        convert_row = _compile_row_converter(columns, as_tuple=as_tuples)
+        
+        with connection.execute_query(data_query) as result:
+            yield from map(convert_row, result)
+    
+    def _export_header(self, file_path: str, include_sample_only: bool, max_rows_per_table: Optional[int], random_sample: bool) -> Dict[str, Any]:
+        """Build the file-level fields that open an export result"""
+        return {
+            "file_path": file_path,
+            "file_name": os.path.basename(file_path),
+            "file_size": os.path.getsize(file_path),
+            "export_type": "sample_only" if include_sample_only else "full_data",
+            "max_rows_per_table": max_rows_per_table,
+            "random_sample": random_sample
+        }
+    
+    def export_file_data(self, file_path: str, include_sample_only: bool = False, max_rows_per_table: int = None, workers: int = 1, random_sample: bool = False) -> Dict[str, Any]:
+        """
+        Export all data from a .hyper file to JSON format
+        
+        This holds the whole export in memory; use write_export() to stream large files.
+        
+        Args:
+            file_path: Path to the .hyper file
+            include_sample_only: If True, only export sample data (first 5 rows per table)
+            max_rows_per_table: Maximum number of rows to export per table (None = all rows)
+            workers: Number of tables to read in parallel
+            random_sample: If True, capped exports sample rows at random
+            
+        Returns:
+            Dictionary containing all file data in JSON format
+        """
+        error = self._check_hyper_file(file_path)
+        if error:
+            return error
+        
+        try:
+            result = self._export_header(file_path, include_sample_only, max_rows_per_table, random_sample)
+            result["success"] = True
+            
+            schemas = []
+            tables_data = []
+            total_exported = 0
+            
+            for table_info, rows in self.iter_export_file_data(file_path, include_sample_only, max_rows_per_table, workers, random_sample):
+                try:
+                    exported_data = list(rows)
+                    total_exported += len(exported_data)
+                except Exception as e:
+                    exported_data = []
+                    print(f"Warning: Could not export data from {table_info['full_name']}: {e}", file=sys.stderr)
                 
-                result["tables"] = tables_data
-                result["total_tables"] = len(tables_data)
-                result["total_rows_exported"] = total_exported
+                table_info["exported_rows"] = len(exported_data)
+                table_info["data"] = exported_data
+                tables_data.append(table_info)
                 
+                if table_info["schema"] not in schemas:
+                    schemas.append(table_info["schema"])
+            
+            result["schemas"] = schemas
+            result["tables"] = tables_data
+            result["total_tables"] = len(tables_data)
+            result["total_rows_exported"] = total_exported
+            
             return result
             
         except HyperException as e:
@@ -226,28 +781,221 @@ class HyperFileInspector:
                 "success": False,
                 "file_path": file_path
             }
-
-    def inspect_file(self, file_path: str) -> Dict[str, Any]:
+    
+    def write_export(self, file_path: str, out: TextIO, include_sample_only: bool = False, max_rows_per_table: int = None, workers: int = 1, random_sample: bool = False) -> None:
         """
-        Inspect a single .hyper file and return metadata
+        Stream an export of a .hyper file to `out` as JSON
+        
+        The document has the same shape as the export_file_data() result, but rows are
+        encoded and written one per line as they are read, so memory use does not grow
+        with the size of the file. Totals and the success flag close the document.
+        
+        Args:
+            file_path: Path to the .hyper file
+            out: Text stream to write the JSON document to
+            include_sample_only: If True, only export sample data (first 5 rows per table)
+            max_rows_per_table: Maximum number of rows to export per table (None = all rows)
+            workers: Number of tables to read in parallel
+            random_sample: If True, capped exports sample rows at random
+        """
+        error = self._check_hyper_file(file_path)
+        if error:
+            out.write(_dumps(error, indent=True))
+            return
+        
+        # Header fields are written without the closing brace, trailer fields
+        # without the opening one, so the tables array can be streamed in between
+        header = self._export_header(file_path, include_sample_only, max_rows_per_table, random_sample)
+        out.write(_dumps(header)[:-1] + ',\n"tables": [')
+        
+        trailer = {"success": True}
+        schemas = []
+        total_tables = 0
+        total_exported = 0
+        
+        try:
+            for table_info, rows in self.iter_export_file_data(file_path, include_sample_only, max_rows_per_table, workers, random_sample):
+                if total_tables:
+                    out.write(',')
+                out.write('\n' + _dumps(table_info)[:-1] + ', "data": [')
+                
+                exported_rows = 0
+                try:
+                    for row_data in rows:
+                        out.write(',\n' if exported_rows else '\n')
+                        out.write(_dumps(row_data))
+                        exported_rows += 1
+                except Exception as e:
+                    print(f"Warning: Could not export data from {table_info['full_name']}: {e}", file=sys.stderr)
+                
+                out.write(f'\n], "exported_rows": {exported_rows}}}')
+                
+                total_tables += 1
+                total_exported += exported_rows
+                if table_info["schema"] not in schemas:
+                    schemas.append(table_info["schema"])
+                    
+        except HyperException as e:
+            trailer = {"success": False, "error": f"Hyper API error: {str(e)}"}
+        except Exception as e:
+            trailer = {"success": False, "error": f"Unexpected error: {str(e)}"}
+        
+        trailer.update({
+            "schemas": schemas,
+            "total_tables": total_tables,
+            "total_rows_exported": total_exported
+        })
+        out.write('\n],\n' + _dumps(trailer)[1:])
+    
+    def write_export_files(self, file_path: str, output_dir: str, file_format: str, include_sample_only: bool = False, max_rows_per_table: int = None, workers: int = 1, random_sample: bool = False, compress: bool = False) -> Dict[str, Any]:
+        """
+        Export each table of a .hyper file to its own CSV or Parquet file
+        
+        Rows are streamed to the files as they are read, as tuples, without
+        building a dictionary per row. Parquet files are written in record batches
+        of PARQUET_BATCH_ROWS rows, typed from the Hyper columns, with zstd compression.
         
         Args:
             file_path: Path to the .hyper file
+            output_dir: Directory to write the table files to (created if missing)
+            file_format: "csv" or "parquet"
+            include_sample_only: If True, only export sample data (first 5 rows per table)
+            max_rows_per_table: Maximum number of rows to export per table (None = all rows)
+            workers: Number of tables to read in parallel
+            random_sample: If True, capped exports sample rows at random
+            compress: If True, gzip-compress CSV files
             
         Returns:
-            Dictionary containing file metadata and schema information
+            The export result without the data, naming the file each table was written to
         """
-        if not os.path.exists(file_path):
+        error = self._check_hyper_file(file_path)
+        if error:
+            return error
+        
+        if file_format == "parquet" and pq is None:
             return {
-                "error": f"File not found: {file_path}",
-                "success": False
+                "error": "Parquet export requires pyarrow. Run: pip install pyarrow",
+                "success": False,
+                "file_path": file_path
             }
         
-        if not file_path.lower().endswith('.hyper'):
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            
+            result = self._export_header(file_path, include_sample_only, max_rows_per_table, random_sample)
+            result.update({"format": file_format, "output_dir": output_dir, "success": True})
+            
+            if file_format == "parquet":
+                tables_data = self._write_parquet_files(file_path, output_dir, include_sample_only, max_rows_per_table, workers, random_sample)
+            else:
+                tables_data = self._write_csv_files(file_path, output_dir, include_sample_only, max_rows_per_table, workers, random_sample, compress)
+            
+            schemas = []
+            for table_info in tables_data:
+                if table_info["schema"] not in schemas:
+                    schemas.append(table_info["schema"])
+            
+            result["schemas"] = schemas
+            result["tables"] = tables_data
+            result["total_tables"] = len(tables_data)
+            result["total_rows_exported"] = sum(table_info["exported_rows"] for table_info in tables_data)
+            
+            return result
+            
+        except HyperException as e:
             return {
-                "error": f"Not a .hyper file: {file_path}",
-                "success": False
+                "error": f"Hyper API error: {str(e)}",
+                "success": False,
+                "file_path": file_path
+            }
+        except Exception as e:
+            return {
+                "error": f"Unexpected error: {str(e)}",
+                "success": False,
+                "file_path": file_path
             }
+    
+    def _write_csv_files(self, file_path: str, output_dir: str, include_sample_only: bool, max_rows_per_table: Optional[int], workers: int, random_sample: bool, compress: bool) -> List[Dict[str, Any]]:
+        """Stream every table to a CSV file with a header row of column names"""
+        tables_data = []
+        used_names = set()
+        extension = ".csv.gz" if compress else ".csv"
+        
+        for table_info, rows in self.iter_export_file_data(file_path, include_sample_only, max_rows_per_table, workers, random_sample, as_tuples=True):
+            output_file = os.path.join(output_dir, _table_file_name(table_info, extension, used_names))
+            if compress:
+                csv_file = gzip.open(output_file, 'wt', compresslevel=1, encoding='utf-8', newline='')
+            else:
+                csv_file = open(output_file, 'w', encoding='utf-8', newline='')
+            
+            exported_rows = 0
+            with csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow([column["name"] for column in table_info["columns"]])
+                try:
+                    for row in rows:
+                        writer.writerow(row)
+                        exported_rows += 1
+                except Exception as e:
+                    print(f"Warning: Could not export data from {table_info['full_name']}: {e}", file=sys.stderr)
+            
+            table_info["exported_rows"] = exported_rows
+            table_info["output_file"] = output_file
+            tables_data.append(table_info)
+        
+        return tables_data
+    
+    def _write_parquet_files(self, file_path: str, output_dir: str, include_sample_only: bool, max_rows_per_table: Optional[int], workers: int, random_sample: bool) -> List[Dict[str, Any]]:
+        """Stream every table to a Parquet file, one record batch at a time"""
+        tables_data = []
+        used_names = set()
+        
+        for table_info, rows in self.iter_export_file_data(file_path, include_sample_only, max_rows_per_table, workers, random_sample, as_tuples=True):
+            output_file = os.path.join(output_dir, _table_file_name(table_info, ".parquet", used_names))
+            arrow_types = [_arrow_type(column["type"]) for column in table_info["columns"]]
+            schema = pa.schema([(column["name"], arrow_type) for column, arrow_type in zip(table_info["columns"], arrow_types)])
+            
+            exported_rows = 0
+            try:
+                with pq.ParquetWriter(output_file, schema, compression="zstd") as writer:
+                    # islice pulls the next batch of rows straight from the query result
+                    while True:
+                        batch = list(islice(rows, PARQUET_BATCH_ROWS))
+                        if not batch:
+                            break
+                        arrays = [_arrow_array(values, arrow_type) for values, arrow_type in zip(zip(*batch), arrow_types)]
+                        writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                        exported_rows += len(batch)
+            except Exception as e:
+                # Free the connection for the next table, and remove the partly written
+                # file: without its footer it can't be read
+                rows.close()
+                if os.path.exists(output_file):
+                    os.remove(output_file)
+                output_file = None
+                exported_rows = 0
+                print(f"Warning: Could not export data from {table_info['full_name']}: {e}", file=sys.stderr)
+            
+            table_info["exported_rows"] = exported_rows
+            table_info["output_file"] = output_file
+            tables_data.append(table_info)
+        
+        return tables_data
+    
+    def inspect_file(self, file_path: str, exact_count: bool = False) -> Dict[str, Any]:
+        """
+        Inspect a single .hyper file and return metadata
+        
+        Args:
+            file_path: Path to the .hyper file
+            exact_count: If True, count rows with COUNT(*) instead of using catalog estimates
+            
+        Returns:
+            Dictionary containing file metadata and schema information
+        """
+        error = self._check_hyper_file(file_path)
+        if error:
+            return error
         
         try:
             result = {
@@ -262,11 +1010,7 @@ class HyperFileInspector:
             }
             
             # Connect to the Hyper file
-            with Connection(
-                endpoint=self.hyper_process.endpoint,
-                database=file_path,
-                create_mode=CreateMode.NONE
-            ) as connection:
+            with self._connect(file_path) as connection:
                 
                 # Get all schemas
                 schemas_query = """
@@ -286,83 +1030,36 @@ class HyperFileInspector:
                 tables_info = []
                 total_rows = 0
                 
-                for schema in schemas:
-                    # Get tables in this schema
-                    tables_query = f"""
-                        SELECT tablename as table_name, 'TABLE' as table_type
-                        FROM pg_tables 
-                        WHERE schemaname = '{schema}'
-                    """
+                # Columns and row counts for every table come back in one query each
+                tables, table_oids = self._list_tables(connection, schemas)
+                row_counts, estimated = self._get_row_counts(connection, tables, table_oids, exact_count)
+                
+                for table, row_count, row_count_estimated in zip(tables, row_counts, estimated):
+                    full_table_name = table["full_name"]
                     
-                    for table_row in connection.execute_list_query(tables_query):
-                        table_name = table_row[0]
-                        table_type = table_row[1]
-                        full_table_name = f'"{schema}"."{table_name}"'
-                        
-                        # Get column information
-                        columns_query = f"""
-                            SELECT 
-                                a.attname as column_name,
-                                pg_catalog.format_type(a.atttypid, a.atttypmod) as data_type,
-                                CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END as is_nullable,
-                                NULL as column_default
-                            FROM pg_attribute a
-                            WHERE a.attrelid = '"{schema}"."{table_name}"'::regclass
-                                AND a.attnum > 0 
-                                AND NOT a.attisdropped
-                            ORDER BY a.attnum
-                        """
-                        
-                        columns = []
-                        for col_row in connection.execute_list_query(columns_query):
-                            columns.append({
-                                "name": col_row[0],
-                                "type": col_row[1],
-                                "nullable": col_row[2] == "YES",
-                                "default": col_row[3]
-                            })
-                        
-                        # Get row count
-                        try:
-                            count_query = f'SELECT COUNT(*) FROM {full_table_name}'
-                            row_count = connection.execute_scalar_query(count_query)
-                            total_rows += row_count
-                        except:
-                            row_count = "Unable to determine"
-                        
-                        # Get sample data (first 5 rows)
-                        sample_data = []
-                        try:
-                            sample_query = f'SELECT * FROM {full_table_name} LIMIT 5'
-                            for sample_row in connection.execute_list_query(sample_query):
-                                # Convert values to JSON-serializable format
-                                row_data = []
-                                for value in sample_row:
-                                    if value is None:
-                                        row_data.append(None)
-                                    elif hasattr(value, 'isoformat'):  # DateTime objects
-                                        row_data.append(value.isoformat())
-                                    else:
-                                        row_data.append(str(value))
-                                sample_data.append(row_data)
-                        except Exception as e:
-                            sample_data = [f"Error retrieving sample data: {str(e)}"]
-                        
-                        table_info = {
-                            "schema": schema,
-                            "name": table_name,
-                            "full_name": full_table_name,
-                            "type": table_type,
-                            "columns": columns,
-                            "row_count": row_count,
-                            "sample_data": sample_data
-                        }
-                        
-                        tables_info.append(table_info)
+                    if row_count is None:
+                        row_count = "Unable to determine"
+                    else:
+                        total_rows += row_count
+                    
+                    # Get sample data (first 5 rows)
+                    # Keep native types; _dumps stringifies anything else non-JSON
+                    convert_row = _compile_row_converter(table["columns"], as_tuple=True)
+                    try:
+                        sample_query = f'SELECT * FROM {full_table_name} LIMIT 5'
+                        with connection.execute_query(sample_query) as sample_rows:
+                            sample_data = list(map(convert_row, sample_rows))
+                    except Exception as e:
+                        sample_data = [f"Error retrieving sample data: {str(e)}"]
+                    
+                    table_info = dict(table, row_count=row_count, row_count_estimated=row_count_estimated, sample_data=sample_data)
+                    
+                    tables_info.append(table_info)
                 
                 result["tables"] = tables_info
                 result["total_tables"] = len(tables_info)
                 result["total_rows"] = total_rows
+                result["total_rows_estimated"] = any(estimated)
                 
             return result
             
@@ -379,15 +1076,12 @@ class HyperFileInspector:
                 "file_path": file_path
             }
     
-    def discover_hyper_files(self, directory: str) -> Dict[str, Any]:
+    def _check_directory(self, directory: str) -> Optional[Dict[str, Any]]:
         """
-        Discover all .hyper files in a directory and its subdirectories
+        Validate that a path points at an existing directory
         
-        Args:
-            directory: Directory to search
-            
         Returns:
-            Dictionary containing list of found .hyper files
+            An error result dictionary, or None if the directory can be searched
         """
         if not os.path.exists(directory):
             return {
@@ -401,19 +1095,44 @@ class HyperFileInspector:
                 "success": False
             }
         
-        try:
-            hyper_files = []
-            directory_path = Path(directory)
+        return None
+    
+    def iter_hyper_files(self, directory: str) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily discover the .hyper files in a directory and its subdirectories
+        
+        Args:
+            directory: Directory to search
             
-            # Search for .hyper files recursively
-            for hyper_file in directory_path.rglob("*.hyper"):
-                file_info = {
-                    "path": str(hyper_file.absolute()),
-                    "name": hyper_file.name,
-                    "size": hyper_file.stat().st_size,
-                    "modified": hyper_file.stat().st_mtime
-                }
-                hyper_files.append(file_info)
+        Yields:
+            File information dictionaries, as each file is found
+        """
+        for entry in _scan_hyper_files(os.path.abspath(directory)):
+            # DirEntry caches its stat result, so each file is stat'ed once
+            stat_result = entry.stat()
+            yield {
+                "path": entry.path,
+                "name": entry.name,
+                "size": stat_result.st_size,
+                "modified": stat_result.st_mtime
+            }
+    
+    def discover_hyper_files(self, directory: str) -> Dict[str, Any]:
+        """
+        Discover all .hyper files in a directory and its subdirectories
+        
+        Args:
+            directory: Directory to search
+            
+        Returns:
+            Dictionary containing list of found .hyper files
+        """
+        error = self._check_directory(directory)
+        if error:
+            return error
+        
+        try:
+            hyper_files = list(self.iter_hyper_files(directory))
             
             return {
                 "success": True,
@@ -428,42 +1147,257 @@ class HyperFileInspector:
                 "success": False,
                 "directory": directory
             }
+    
+    def write_discovery(self, directory: str, out: TextIO) -> None:
+        """
+        Stream the .hyper files found in a directory to `out` as JSON
+        
+        The document has the same shape as the discover_hyper_files() result, with one
+        file per line written and flushed as soon as it is found.
+        
+        Args:
+            directory: Directory to search
+            out: Text stream to write the JSON document to
+        """
+        error = self._check_directory(directory)
+        if error:
+            out.write(_dumps(error, indent=True))
+            return
+        
+        out.write(_dumps({"directory": directory})[:-1] + ',\n"files": [')
+        
+        trailer = {"success": True}
+        files_found = 0
+        
+        try:
+            for file_info in self.iter_hyper_files(directory):
+                out.write(',\n' if files_found else '\n')
+                out.write(_dumps(file_info))
+                out.flush()
+                files_found += 1
+        except Exception as e:
+            trailer = {"success": False, "error": f"Error discovering files: {str(e)}"}
+        
+        trailer["files_found"] = files_found
+        out.write('\n],\n' + _dumps(trailer)[1:])
+
+
+def _open_output(output: Optional[str], compress: bool) -> ContextManager[TextIO]:
+    """
+    Open the text stream results are written to
+    
+    Writes to the output file if one is given, otherwise to stdout, encoded as
+    UTF-8 either way. Output is gzip-compressed when asked for or when the file
+    name ends in .gz; the fastest compression level is used since exports are
+    large and mostly repetitive.
+    """
+    if output and (compress or output.endswith('.gz')):
+        return gzip.open(output, 'wt', compresslevel=1, encoding='utf-8')
+    if output:
+        return open(output, 'w', encoding='utf-8')
+    if compress:
+        sys.stdout.flush()
+        return io.TextIOWrapper(gzip.GzipFile(fileobj=sys.stdout.buffer, mode='wb', compresslevel=1), encoding='utf-8')
+    sys.stdout.reconfigure(encoding='utf-8')
+    return nullcontext(sys.stdout)
+
+
+def _run_command(inspector: HyperFileInspector, request: Dict[str, Any], out: TextIO) -> None:
+    """
+    Run one inspector command and write its JSON result to out
+    
+    The request holds the command ("cmd"), the target "path" and the optional
+    "sample_only", "max_rows", "exact_count", "workers" and "random_sample"
+    settings. Exports with a "format" of csv or parquet write one file per table
+    to the "output" directory (gzipped CSV with "compress") and write a summary
+    to out. "release" closes the inspector's cached connection to the file. It is
+    shared by the command line and the daemon.
+    """
+    command = request.get("cmd")
+    path = request.get("path")
+    file_format = request.get("format", "json")
+    
+    if command == "export" and file_format == "json":
+        # Exports are streamed straight to the output as rows are read
+        inspector.write_export(
+            path,
+            out,
+            include_sample_only=request.get("sample_only", False),
+            max_rows_per_table=request.get("max_rows"),
+            workers=request.get("workers", 1),
+            random_sample=request.get("random_sample", False)
+        )
+        return
+    
+    if command == "discover":
+        # Files are streamed to the output as they are found
+        inspector.write_discovery(path, out)
+        return
+    
+    if command == "export":
+        result = inspector.write_export_files(
+            path,
+            request.get("output"),
+            file_format,
+            include_sample_only=request.get("sample_only", False),
+            max_rows_per_table=request.get("max_rows"),
+            workers=request.get("workers", 1),
+            random_sample=request.get("random_sample", False),
+            compress=request.get("compress", False)
+        )
+    elif command == "inspect":
+        result = inspector.inspect_file(path, exact_count=request.get("exact_count", False))
+    elif command == "release":
+        result = {"file_path": path, "released": inspector.release_connection(path), "success": True}
+    else:
+        result = {"error": f"Unknown command: {command}", "success": False}
+    
+    # Output result as JSON
+    out.write(_dumps(result, indent=True))
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Answer one line-delimited JSON request per socket connection"""
+    
+    def handle(self):
+        request_line = self.rfile.readline()
+        if not request_line:
+            # The client closed without a request, e.g. a liveness check by serve
+            return
+        
+        out = io.TextIOWrapper(self.wfile, encoding='utf-8')
+        try:
+            request = json.loads(request_line)
+        except ValueError as e:
+            out.write(_dumps({"error": f"Invalid request: {str(e)}", "success": False}, indent=True))
+        else:
+            try:
+                _run_command(self.server.inspector, request, out)
+            except Exception as e:
+                out.write(_dumps({"error": f"Critical error: {str(e)}", "success": False}, indent=True))
+        out.flush()
+        out.detach()
+
+
+def serve(inspector: HyperFileInspector, socket_path: str) -> None:
+    """
+    Serve inspector commands on a UNIX socket until interrupted
+    
+    Each client connection sends one JSON request line, e.g.
+    {"cmd": "inspect", "path": "/data/file.hyper"}, and reads the JSON result until
+    the daemon closes the connection. Requests are handled one at a time on the
+    inspector's single Hyper process, so its startup cost is paid once.
+    """
+    _remove_stale_socket(socket_path)
+    
+    with socketserver.UnixStreamServer(socket_path, _DaemonRequestHandler) as server:
+        server.inspector = inspector
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(socket_path)
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """
+    Remove a socket left behind by a daemon that is no longer running
+    
+    Raises:
+        FileExistsError: If the path is not a socket, or a daemon still listens on it
+    """
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{socket_path} exists and is not a socket")
+    
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            # Nobody is listening: the socket is stale
+            os.unlink(socket_path)
+            return
+    raise FileExistsError(f"A daemon is already listening on {socket_path}")
+
+
+def _request_daemon(socket_path: str, request: Dict[str, Any], out: TextIO) -> None:
+    """Send a request to a running daemon and copy its JSON result to out"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        with sock.makefile('r', encoding='utf-8') as response:
+            shutil.copyfileobj(response, out)
 
 
 def main():
     """Main entry point for the script"""
     parser = argparse.ArgumentParser(description="Inspect Tableau Hyper files")
-    parser.add_argument("command", choices=["inspect", "discover", "export"], help="Command to execute")
-    parser.add_argument("path", help="Path to .hyper file or directory")
-    parser.add_argument("--output", "-o", help="Output file (optional, defaults to stdout)")
+    parser.add_argument("command", choices=["inspect", "discover", "export", "serve", "release"], help="Command to execute")
+    parser.add_argument("path", nargs="?", help="Path to .hyper file or directory")
+    parser.add_argument("--output", "-o", help="Output file (optional, defaults to stdout), or the directory for csv/parquet table files")
+    parser.add_argument("--format", choices=["json", "csv", "parquet"], default="json", help="Export format; csv and parquet write one file per table to --output")
     parser.add_argument("--sample-only", action="store_true", help="Export only sample data (first 5 rows per table)")
     parser.add_argument("--max-rows", type=int, help="Maximum number of rows to export per table")
+    parser.add_argument("--random-sample", action="store_true", help="With --sample-only or --max-rows, sample rows at random instead of taking the first ones")
+    parser.add_argument("--exact-count", action="store_true", help="Count rows with COUNT(*) instead of catalog estimates when inspecting")
+    parser.add_argument("--gzip", action="store_true", help="Gzip-compress the output (implied by an --output name ending in .gz)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of tables to export in parallel (each table being read in parallel is held in memory until written)")
+    parser.add_argument("--socket", help="UNIX socket for the serve command to listen on")
+    parser.add_argument("--daemon-socket", help="Send the command to a daemon started with serve instead of starting Hyper")
+    parser.add_argument("--pool-size", type=int, default=DAEMON_MAX_CONNECTIONS, help=f"Idle file connections the serve daemon keeps open for reuse (default {DAEMON_MAX_CONNECTIONS}, 0 disables)")
+    parser.add_argument("--pool-ttl", type=float, default=DAEMON_CONNECTION_TTL_MINUTES, help=f"Minutes the serve daemon keeps an idle file connection open (default {DAEMON_CONNECTION_TTL_MINUTES}, 0 = no limit)")
     
     args = parser.parse_args()
     
+    if args.command == "serve" and not args.socket:
+        parser.error("serve requires --socket")
+    if args.command != "serve" and not args.path:
+        parser.error(f"{args.command} requires a path")
+    if args.command == "release" and not args.daemon_socket:
+        parser.error("release requires --daemon-socket")
+    if args.format != "json" and not args.output:
+        parser.error(f"--format {args.format} requires --output (a directory for the table files)")
+    
+    # With csv/parquet, --output is the directory for the table files and the
+    # JSON summary goes to stdout; --gzip applies to the CSV files
+    table_files = args.command == "export" and args.format != "json"
+    output = None if table_files else args.output
+    
+    request = {
+        "cmd": args.command,
+        # The daemon may run from another working directory
+        "path": os.path.abspath(args.path) if args.daemon_socket else args.path,
+        "sample_only": args.sample_only,
+        "max_rows": args.max_rows,
+        "exact_count": args.exact_count,
+        "workers": args.workers,
+        "random_sample": args.random_sample,
+        "format": args.format,
+        "output": os.path.abspath(args.output) if table_files and args.daemon_socket else args.output,
+        "compress": args.gzip
+    }
+    
     try:
-        with HyperFileInspector() as inspector:
-            if args.command == "inspect":
-                result = inspector.inspect_file(args.path)
-            elif args.command == "discover":
-                result = inspector.discover_hyper_files(args.path)
-            elif args.command == "export":
-                result = inspector.export_file_data(
-                    args.path, 
-                    include_sample_only=args.sample_only,
-                    max_rows_per_table=args.max_rows
-                )
+        if args.command == "serve":
+            connection_ttl = args.pool_ttl * 60 if args.pool_ttl > 0 else None
+            with HyperFileInspector(max_connections=args.pool_size, connection_ttl=connection_ttl) as inspector:
+                serve(inspector, args.socket)
+            return
+        
+        with _open_output(output, args.gzip and not table_files) as out:
+            if args.daemon_socket:
+                _request_daemon(args.daemon_socket, request, out)
             else:
-                result = {"error": f"Unknown command: {args.command}", "success": False}
+                with HyperFileInspector() as inspector:
+                    _run_command(inspector, request, out)
             
-            # Output result as JSON
-            json_output = json.dumps(result, indent=2, default=str)
-            
-            if args.output:
-                with open(args.output, 'w') as f:
-                    f.write(json_output)
-            else:
-                print(json_output)
+            if not output:
+                out.write('\n')
                 
     except Exception as e:
         error_result = {
@@ -67,6 +67,14 @@ export class HyperFilesInspector {
         return Math.round(bytes / Math.pow(1024, i) * 100) / 100 + ' ' + sizes[i];
     }
 
+    /**
+     * Format a row count, marking catalog estimates as approximate
+     */
+    formatRowCount(count, estimated = false) {
+        if (typeof count !== 'number') return count ?? 'Unknown';
+        return (estimated ? '~' : '') + count.toLocaleString();
+    }
+
     /**
      * Format timestamp to readable date
      */
@@ -100,11 +108,15 @@ export class HyperFilesInspector {
     /**
      * Inspect a single .hyper file
      */
-    async inspectFile(filePath) {
+    async inspectFile(filePath, options = {}) {
+        const { exactCount = false } = options;
         const spinner = ora(`Inspecting ${path.basename(filePath)}...`).start();
         
         try {
-            const result = await this.executePython(['inspect', filePath]);
+            const args = ['inspect', filePath];
+            if (exactCount) args.push('--exact-count');
+            
+            const result = await this.executePython(args);
             spinner.stop();
             
             if (!result.success) {
@@ -239,7 +251,7 @@ export class HyperFilesInspector {
                 tableData.push([
                     table.name,
                     table.schema,
-                    typeof table.total_rows === 'number' ? table.total_rows.toLocaleString() : table.total_rows,
+                    this.formatRowCount(table.total_rows, table.total_rows_estimated),
                     table.exported_rows.toLocaleString(),
                     table.columns.length.toString()
                 ]);
@@ -272,7 +284,10 @@ export class HyperFilesInspector {
         console.log(`   Size: ${this.formatFileSize(result.file_size)}`);
         console.log(`   Path: ${result.file_path}`);
         console.log(`   Total Tables: ${result.total_tables}`);
-        console.log(`   Total Rows: ${result.total_rows.toLocaleString()}`);
+        console.log(`   Total Rows: ${this.formatRowCount(result.total_rows, result.total_rows_estimated)}`);
+        if (result.total_rows_estimated) {
+            console.log(chalk.gray('   (~ marks estimated row counts; use --exact-count for exact counts)'));
+        }
         
         // Schemas
         if (result.schemas.length > 0) {
@@ -289,7 +304,7 @@ export class HyperFilesInspector {
             result.tables.forEach((table, index) => {
                 console.log(`\\n   ${index + 1}. ${chalk.cyan(table.full_name)}`);
                 console.log(`      Type: ${table.type}`);
-                console.log(`      Rows: ${typeof table.row_count === 'number' ? table.row_count.toLocaleString() : table.row_count}`);
+                console.log(`      Rows: ${this.formatRowCount(table.row_count, table.row_count_estimated)}`);
                 console.log(`      Columns: ${table.columns.length}`);
                 
                 // Column details
@@ -395,8 +410,11 @@ program
     .command('inspect')
     .description('Inspect a specific .hyper file')
     .argument('<file>', 'Path to the .hyper file')
-    .action(async (file) => {
-        const result = await inspector.inspectFile(file);
+    .option('-e, --exact-count', 'Count rows exactly with COUNT(*) instead of using estimates (slower)')
+    .action(async (file, options) => {
+        const result = await inspector.inspectFile(file, {
+            exactCount: options.exactCount
+        });
         if (result) {
             inspector.displayInspectionResults(result);
         }
@@ -52,9 +52,14 @@ class HyperFilesInspector {
         });
     }
 
-    async inspectFile(filePath) {
+    async inspectFile(filePath, options = {}) {
+        const { exactCount = false } = options;
+        
         try {
-            const result = await this.executePython(['inspect', filePath]);
+            const args = ['inspect', filePath];
+            if (exactCount) args.push('--exact-count');
+            
+            const result = await this.executePython(args);
             return result.success ? result : null;
         } catch (error) {
             console.error('Error inspecting file:', error.message);
@@ -173,7 +178,9 @@ app.post('/api/inspect/:fileId', async (req, res) => {
             return res.status(404).json({ error: 'File not found' });
         }
 
-        const result = await inspector.inspectFile(filePath);
+        const result = await inspector.inspectFile(filePath, {
+            exactCount: Boolean(req.body && req.body.exactCount)
+        });
         
         if (result) {
             res.json({